@@ -6,11 +6,23 @@ Supports: APA, Chicago, Harvard, IEEE, ACM, MLA
 import streamlit as st
 import re
 import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 import string
 from io import BytesIO
+from html import escape
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ================= Configuration =================
 OPENALEX_BASE = "https://api.openalex.org/works"
@@ -23,6 +35,136 @@ HEADERS = {
 TITLE_THRESHOLD = 85
 TITLE_MISMATCH_THRESHOLD = 70
 REQUEST_DELAY = 0.2
+MAX_WORKERS = 8
+LOOKUP_CACHE_SIZE = 2048
+STYLE_ROW_LIMIT = 2000
+RESULT_CACHE_ENTRIES = 4  # cached CSV/HTML renders kept per server process
+
+# ================= Result Schema =================
+# Matched-record fields that get an "<field>_diff" flag (year is handled separately)
+DIFF_FIELDS = ["oa_title", "oa_full_author", "oa_journal", "oa_volume", "oa_issue", "oa_page_range"]
+
+# oa_year_diff is stored as int8: same year, within two years, different or unknown
+YEAR_SAME, YEAR_MINOR, YEAR_DIFFERENT = 0, 1, 2
+YEAR_DIFF_CODES = {False: YEAR_SAME, "minor": YEAR_MINOR, True: YEAR_DIFFERENT}
+YEAR_DIFF_LABELS = {code: label for label, code in YEAR_DIFF_CODES.items()}
+
+# Low-cardinality text columns stored as pandas categoricals; None means the
+# categories are taken from the data (doc_type passes through unknown types)
+CATEGORY_COLUMNS = {
+    "status": ["verified", "ambiguous", "unverified"],
+    "confidence": ["high", "medium", "low", "unverified"],
+    "data_source": ["OpenAlex", "Crossref", "None"],
+    "doi_fill_status": [
+        "original_correct", "filled_from_database", "title_matched_doi_corrected",
+        "original_wrong_corrected", "doi_title_mismatch", "original_unverified",
+        "unverified", "missing",
+    ],
+    "doc_type": None,
+}
+
+# Precomputed comparison keys; used for scoring but not shown or exported
+HIDDEN_COLUMNS = ["ref_title_std", "ref_surname", "oa_title_std", "oa_surname"]
+
+# Column order of the results frame, already in display order
+RESULT_COLUMNS = [
+    "status", "confidence", "is_retracted", "doc_type", "data_source",
+    "doi", "filled_doi", "doi_fill_status",
+    "raw_reference", "ref_title", "ref_first_author", "ref_year",
+    "ref_journal", "ref_volume", "ref_issue", "ref_page_range",
+    "oa_title", "oa_full_author", "oa_first_author", "oa_year", "oa_year_delta",
+    "oa_journal", "oa_volume", "oa_issue", "oa_page_range", "oa_doi", "openalex_id",
+    "oa_title_diff", "oa_full_author_diff", "oa_year_diff",
+    "oa_journal_diff", "oa_volume_diff", "oa_issue_diff", "oa_page_range_diff",
+] + HIDDEN_COLUMNS
+
+DISPLAY_COLUMNS = RESULT_COLUMNS[:2] + ["status_icon"] + [c for c in RESULT_COLUMNS[2:] if c not in HIDDEN_COLUMNS]
+
+
+# ================= Regex Patterns =================
+# Compiled once at import time; parse_reference runs these for every reference.
+
+_RE_DOI_URL_PREFIX = re.compile(r'^https?://(dx\.)?doi\.org/', re.I)
+_RE_DOI_PREFIX = re.compile(r'^doi:', re.I)
+_RE_DOI = re.compile(r'(?:https?://)?(?:doi\.org/|DOI:?\s*)?(10\.\d{4,9}/[^\s"\'<>\]]+)', re.I)
+_RE_DOI_PLAIN = re.compile(r'(10\.\d{4,9}/[^\s"\'<>]+)', re.I)
+
+_RE_YEAR_PAREN = re.compile(r'\(\d{4}\)')
+_RE_BRACKET_NUM = re.compile(r'^\[\d+\]\s*')
+_RE_DOT_YEAR_DOT = re.compile(r'\.\s*\d{4}\.')
+_RE_LEADING_NUM = re.compile(r'^[\[\(\{]?\d+[\]\)\}]\.?\s*')
+_RE_DASH_SPACING = re.compile(r'\s*-\s*')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_TITLE_QUERY_PUNCT = re.compile(r'[&:?,;]')
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+# Year extraction, tried in order
+_RE_YEAR_IN_PAREN = re.compile(r'\((\d{4})[a-z]?\)')
+_RE_YEAR_BETWEEN_DOTS = re.compile(r'\.\s+(\d{4})\.\s+[\u201c\u201d"\'A-Z]')
+_RE_YEAR_AFTER_MONTH = re.compile(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\.?\s+(\d{4})', re.I)
+_RE_YEAR_BEFORE_DOI = re.compile(r',\s*(\d{4})\.?\s*(?:doi|$)', re.I)
+_RE_YEAR_LOOSE = re.compile(r'[,\s](\d{4})[;,\.]')
+
+# Format detection
+_RE_IEEE_STYLE = re.compile(r'(?:vol\.\s*\d+.*?no\.\s*\d+|IEEE\s+\w+|\d+\(\d+\):\d+)', re.I)
+_RE_VANCOUVER = re.compile(r';\d+\(\d+\):')
+_RE_ANY_QUOTE = re.compile(r'[\u201c\u201d\u2018\u2019"\']')
+
+# Title extraction
+_QUOTE_TITLE_PATS = (
+    re.compile(r'\u201c([^\u201d]+)\u201d'),
+    re.compile(r'\u2018([^\u2019]+)\u2019'),
+    re.compile(r'"([^"]+)"'),
+    re.compile(r"'([^']+)'"),
+    re.compile(r'[\u201c\u201d"\u2018\u2019\'](.+?)[\u201c\u201d"\u2018\u2019\']'),
+)
+_RE_IEEE_LAST_AUTHOR = re.compile(r'\band\s+[A-Z][\w\s\.]+?\.\s+')
+# Anchored alternatives are tried in order, exactly like separate searches
+_RE_IEEE_TITLE = re.compile(
+    r'^(?:([A-Z][^\.]+?)\.\s+[A-Z][\w\s&]+?,?\s*vol\.'
+    r'|([A-Z][^\.]+?)\.\s+[A-Z][\w\s&]+?,\s*\d+\('
+    r'|([A-Z][^\.]{20,}?)\.\s+IEEE)',
+    re.I
+)
+_IEEE_FALLBACK_TITLE_PATS = (
+    re.compile(r'\.\s+([A-Z][a-z][\w\s:,\-]{20,}?)\.\s+IEEE', re.I),
+    re.compile(r'\.\s+([A-Z][a-z][\w\s:,\-]{20,}?)\.\s+[A-Z][\w\s&]+?,\s*\d+\(', re.I),
+    re.compile(r'\.\s+([A-Z][a-z][\w\s:,\-]{20,}?)\.\s+[A-Z][\w\s&]+?,?\s*vol\.', re.I),
+)
+_RE_AUTHOR_INITIALS = re.compile(r'\b[A-Z]{1,3}\s+[A-Z][a-z]+\b')
+_PAREN_YEAR_TITLE_PATS = (
+    re.compile(r'\(\d{4}\)\.\s*(.+?)[\.?!]\s+[A-Z]'),
+    re.compile(r'\(\d{4}\)\s+(.+?)[\.?!]\s+[A-Z]'),
+    re.compile(r'\(\d{4}\)\s*\.?\s*(.+?)[\.?!]\s*(?:In\s+)?(?:Proceedings?|Conference)'),
+)
+_RE_VANCOUVER_TITLE = re.compile(r'\.(.+?)[\.?!]\s+[A-Z][^\.]+\s+\d{4}')
+
+# Journal extraction
+_RE_QUOTE_SPLIT = re.compile(r'[\u201c\u201d\u2018\u2019"\'"]')
+_RE_IEEE_JOURNAL_AFTER_QUOTE = re.compile(r',\s*([^,]+?),\s*(?:vol\.|\d+\()', re.I)
+_IEEE_JOURNAL_PATS = (
+    re.compile(r'\.\s+([A-Z][A-Za-z\s&]+?),\s*vol\.', re.I),
+    re.compile(r'\.\s+([A-Z][A-Za-z\s&]+?),\s*\d+\(', re.I),
+)
+_RE_VANCOUVER_JOURNAL = re.compile(r'\.([^\.]+)\.\s*\d{4};')
+_JOURNAL_PATS = (
+    re.compile(r'[\.?!]\s*[\u201c\u201d"\'"]?([A-Za-z\s&]+?)[\u201c\u201d"\'"]?\s*,?\s*\d+\s*\('),
+    re.compile(r'[\.?!]\s+([A-Z][A-Za-z\s&]+?)\s+\d+\s*\('),
+)
+
+# Volume/Issue/Pages
+_RE_VOL = re.compile(r'vol\.\s*(\d+)', re.I)
+_RE_NO = re.compile(r'no\.\s*(\d+)', re.I)
+_RE_PP = re.compile(r'pp\.\s*([\d–\-—]+)', re.I)
+# Each branch scans the whole text (".*?") before the next is tried, so the
+# first branch to match anywhere wins, as with sequential searches. The
+# "YYYY;V(I):P" and " V(I):P" forms are covered by the first branch.
+_RE_VOL_ISSUE_PAGE = re.compile(
+    r'^(?:.*?(?P<v1>\d+)\s*\((?P<i1>\d+)\):\s*(?P<p1>[\d–\-—]+)'
+    r'|.*?,\s*(?P<v2>\d+)\s*\((?P<i2>\d+)\),\s*(?P<p2>[\d–\-—]+)'
+    r'|.*?\s(?P<v3>\d+):\s*(?P<p3>[\d–\-—]+))',
+    re.S
+)
 
 
 # ================= Helper Functions =================
@@ -31,8 +173,8 @@ def normalize_doi(doi):
     """Normalize DOI by removing URL prefix and trailing punctuation"""
     if not doi:
         return None
-    doi = re.sub(r'^https?://(dx\.)?doi\.org/', '', doi, flags=re.I)
-    doi = re.sub(r'^doi:', '', doi, flags=re.I)
+    doi = _RE_DOI_URL_PREFIX.sub('', doi)
+    doi = _RE_DOI_PREFIX.sub('', doi)
     doi = doi.rstrip('.,;)')
     return doi.lower().strip()
 
@@ -42,8 +184,8 @@ def extract_surname(author_name):
     if not author_name:
         return ""
 
-    author_name = re.sub(r'\(\d{4}\)', '', author_name).strip()
-    author_name = re.sub(r'^\[\d+\]\s*', '', author_name)
+    author_name = _RE_YEAR_PAREN.sub('', author_name).strip()
+    author_name = _RE_BRACKET_NUM.sub('', author_name)
 
     if ',' in author_name:
         surname = author_name.split(',')[0].strip()
@@ -68,7 +210,7 @@ def normalize_page_range(page_range):
     if not page_range or page_range == "-":
         return "-"
     normalized = str(page_range).replace('–', '-').replace('—', '-').replace('−', '-')
-    normalized = re.sub(r'\s*-\s*', '-', normalized)
+    normalized = _RE_DASH_SPACING.sub('-', normalized)
     return normalized.strip()
 
 
@@ -76,11 +218,8 @@ def standardize_title(title):
     """Standardize title for comparison (lowercase, no punctuation)"""
     if not title:
         return ""
-    title = title.lower()
-    title = title.replace("u.k.", "uk").replace("u.s.", "us")
-    title = title.translate(str.maketrans('', '', string.punctuation))
-    title = re.sub(r'\s+', ' ', title).strip()
-    return title
+    title = title.lower().replace("u.k.", "uk").replace("u.s.", "us").translate(_PUNCT_TABLE)
+    return " ".join(title.split())
 
 
 # ================= Reference Parser =================
@@ -88,99 +227,76 @@ def standardize_title(title):
 def parse_reference(raw_ref):
     """Parse mainstream citation formats"""
 
-    text = re.sub(r'^[\[\(\{]?\d+[\]\)\}]\.?\s*', '', raw_ref.strip())
+    text = _RE_LEADING_NUM.sub('', raw_ref.strip())
 
     # DOI Extraction
-    doi_match = re.search(
-        r'(?:https?://)?(?:doi\.org/|DOI:?\s*)?(10\.\d{4,9}/[^\s"\'<>\]]+)',
-        text, re.I
-    )
+    # Every DOI starts with "10."; skip the regex when the prefix is absent
+    doi_match = _RE_DOI.search(text) if '10.' in text else None
     doi = doi_match.group(1).rstrip('.,;)]') if doi_match else None
 
     # Year Extraction
     year = None
     year_in_parentheses = False
 
-    year_match = re.search(r'\((\d{4})[a-z]?\)', text)
+    year_match = _RE_YEAR_IN_PAREN.search(text)
     if year_match:
         year = int(year_match.group(1))
         year_in_parentheses = True
     else:
-        year_match = re.search(r'\.\s+(\d{4})\.\s+[\u201c\u201d"\'A-Z]', text)
+        year_match = _RE_YEAR_BETWEEN_DOTS.search(text)
         if year_match:
             year = int(year_match.group(1))
             year_in_parentheses = False
         else:
-            year_match = re.search(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\.?\s+(\d{4})', text, re.I)
+            year_match = _RE_YEAR_AFTER_MONTH.search(text)
             if year_match:
                 year = int(year_match.group(1))
             else:
-                year_match = re.search(r',\s*(\d{4})\.?\s*(?:doi|$)', text, re.I)
+                year_match = _RE_YEAR_BEFORE_DOI.search(text)
                 if year_match:
                     year = int(year_match.group(1))
                 else:
-                    year_match = re.search(r'[,\s](\d{4})[;,\.]', text)
+                    year_match = _RE_YEAR_LOOSE.search(text)
                     if year_match:
                         year = int(year_match.group(1))
 
     # Detect Format Type
-    is_ieee_style = bool(re.search(r'(?:vol\.\s*\d+.*?no\.\s*\d+|IEEE\s+\w+|\d+\(\d+\):\d+)', text, re.I))
-    is_vancouver = bool(re.search(r';\d+\(\d+\):', text))
-    has_quotes = bool(re.search(r'[\u201c\u201d\u2018\u2019"\'"]', text))
+    is_ieee_style = bool(_RE_IEEE_STYLE.search(text))
+    is_vancouver = bool(_RE_VANCOUVER.search(text))
+    has_quotes = bool(_RE_ANY_QUOTE.search(text))
 
     # Title Extraction
     title = "Unknown"
 
     # Pattern 1: Quoted title
     if has_quotes:
-        quote_patterns = [
-            r'\u201c([^\u201d]+)\u201d',
-            r'\u2018([^\u2019]+)\u2019',
-            r'"([^"]+)"',
-            r"'([^']+)'",
-            r'[\u201c\u201d"\u2018\u2019\'](.+?)[\u201c\u201d"\u2018\u2019\']',
-        ]
-        for pattern in quote_patterns:
-            quote_match = re.search(pattern, text)
+        for pattern in _QUOTE_TITLE_PATS:
+            quote_match = pattern.search(text)
             if quote_match:
                 title = quote_match.group(1).strip()
                 break
 
     # Pattern 2: IEEE format WITHOUT quotes
     if title == "Unknown" and is_ieee_style:
-        last_author_match = re.search(r'\band\s+[A-Z][\w\s\.]+?\.\s+', text)
+        last_author_match = _RE_IEEE_LAST_AUTHOR.search(text)
 
         if last_author_match:
             after_authors = text[last_author_match.end():]
 
-            title_patterns = [
-                r'^([A-Z][^\.]+?)\.\s+[A-Z][\w\s&]+?,?\s*vol\.',
-                r'^([A-Z][^\.]+?)\.\s+[A-Z][\w\s&]+?,\s*\d+\(',
-                r'^([A-Z][^\.]{20,}?)\.\s+IEEE',
-            ]
-
-            for pattern in title_patterns:
-                title_match = re.search(pattern, after_authors, re.I)
-                if title_match:
-                    title = title_match.group(1).strip()
-                    break
+            title_match = _RE_IEEE_TITLE.match(after_authors)
+            if title_match:
+                title = title_match.group(title_match.lastindex).strip()
 
         if title == "Unknown":
-            fallback_patterns = [
-                r'\.\s+([A-Z][a-z][\w\s:,\-]{20,}?)\.\s+IEEE',
-                r'\.\s+([A-Z][a-z][\w\s:,\-]{20,}?)\.\s+[A-Z][\w\s&]+?,\s*\d+\(',
-                r'\.\s+([A-Z][a-z][\w\s:,\-]{20,}?)\.\s+[A-Z][\w\s&]+?,?\s*vol\.',
-            ]
-
-            for pattern in fallback_patterns:
-                fallback_match = re.search(pattern, text, re.I)
+            for pattern in _IEEE_FALLBACK_TITLE_PATS:
+                fallback_match = pattern.search(text)
                 if fallback_match:
                     potential_title = fallback_match.group(1).strip()
-                    if not re.search(r'\b[A-Z]{1,3}\s+[A-Z][a-z]+\b', potential_title[:40]):
+                    if not _RE_AUTHOR_INITIALS.search(potential_title[:40]):
                         title = potential_title
                         break
 
-    # Pattern 3: Year WITHOUT parentheses
+    # Pattern 3: Year WITHOUT parentheses (patterns depend on the year, so not precompiled)
     if title == "Unknown" and not year_in_parentheses and year:
         title_match = re.search(rf'\.\s+{year}\.\s+[\u201c\u201d"\'"]?(.+?)[\u201c\u201d"\'"]?[\.?!]\s+[A-Z]', text)
         if title_match:
@@ -192,14 +308,8 @@ def parse_reference(raw_ref):
 
     # Pattern 4: Year WITH parentheses
     if title == "Unknown" and year_in_parentheses:
-        patterns = [
-            r'\(\d{4}\)\.\s*(.+?)[\.?!]\s+[A-Z]',
-            r'\(\d{4}\)\s+(.+?)[\.?!]\s+[A-Z]',
-            r'\(\d{4}\)\s*\.?\s*(.+?)[\.?!]\s*(?:In\s+)?(?:Proceedings?|Conference)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in _PAREN_YEAR_TITLE_PATS:
+            match = pattern.search(text)
             if match:
                 potential_title = match.group(1).strip()
                 if len(potential_title) > 10:
@@ -208,7 +318,7 @@ def parse_reference(raw_ref):
 
     # Pattern 5: Vancouver style
     if title == "Unknown" and is_vancouver:
-        title_match = re.search(r'\.(.+?)[\.?!]\s+[A-Z][^\.]+\s+\d{4}', text)
+        title_match = _RE_VANCOUVER_TITLE.search(text)
         if title_match:
             title = title_match.group(1).strip()
 
@@ -224,18 +334,14 @@ def parse_reference(raw_ref):
 
     if is_ieee_style:
         if has_quotes:
-            parts = re.split(r'[\u201c\u201d\u2018\u2019"\'"]', text)
+            parts = _RE_QUOTE_SPLIT.split(text)
             after_quote = parts[-1] if len(parts) > 1 else text
-            ieee_match = re.search(r',\s*([^,]+?),\s*(?:vol\.|\d+\()', after_quote, re.I)
+            ieee_match = _RE_IEEE_JOURNAL_AFTER_QUOTE.search(after_quote)
             if ieee_match:
                 journal = ieee_match.group(1).strip()
         else:
-            ieee_patterns = [
-                r'\.\s+([A-Z][A-Za-z\s&]+?),\s*vol\.',
-                r'\.\s+([A-Z][A-Za-z\s&]+?),\s*\d+\(',
-            ]
-            for pattern in ieee_patterns:
-                ieee_match = re.search(pattern, text, re.I)
+            for pattern in _IEEE_JOURNAL_PATS:
+                ieee_match = pattern.search(text)
                 if ieee_match:
                     potential_journal = ieee_match.group(1).strip()
                     if len(potential_journal) < 100:
@@ -243,18 +349,13 @@ def parse_reference(raw_ref):
                         break
 
     elif is_vancouver:
-        vanc_match = re.search(r'\.([^\.]+)\.\s*\d{4};', text)
+        vanc_match = _RE_VANCOUVER_JOURNAL.search(text)
         if vanc_match:
             journal = vanc_match.group(1).strip()
 
     else:
-        patterns = [
-            r'[\.?!]\s*[\u201c\u201d"\'"]?([A-Za-z\s&]+?)[\u201c\u201d"\'"]?\s*,?\s*\d+\s*\(',
-            r'[\.?!]\s+([A-Z][A-Za-z\s&]+?)\s+\d+\s*\(',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in _JOURNAL_PATS:
+            match = pattern.search(text)
             if match:
                 journal = match.group(1).strip()
                 break
@@ -263,9 +364,9 @@ def parse_reference(raw_ref):
     volume, issue, page_range = "-", "-", "-"
 
     if 'vol.' in text.lower():
-        vol_match = re.search(r'vol\.\s*(\d+)', text, re.I)
-        issue_match = re.search(r'no\.\s*(\d+)', text, re.I)
-        page_match = re.search(r'pp\.\s*([\d–\-—]+)', text, re.I)
+        vol_match = _RE_VOL.search(text)
+        issue_match = _RE_NO.search(text)
+        page_match = _RE_PP.search(text)
 
         if vol_match:
             volume = vol_match.group(1)
@@ -275,52 +376,40 @@ def parse_reference(raw_ref):
             page_range = normalize_page_range(page_match.group(1))
 
     if page_range == "-":
-        patterns = [
-            (r'(\d+)\s*\((\d+)\):\s*([\d–\-—]+)', True),
-            (r',\s*(\d+)\s*\((\d+)\),\s*([\d–\-—]+)', True),
-            (r'\d{4};(\d+)\((\d+)\):([\d–\-—]+)', True),
-            (r'\s(\d+)\s*\((\d+)\):\s*([\d–\-—]+)', True),
-            (r'\s(\d+):\s*([\d–\-—]+)', False),
-        ]
-
-        for pattern, has_issue in patterns:
-            match = re.search(pattern, text)
-            if match:
-                if has_issue:
-                    volume, issue, page_range = match.groups()
-                else:
-                    volume = match.group(1)
-                    issue = "-"
-                    page_range = match.group(2)
-                page_range = normalize_page_range(page_range)
-                break
+        match = _RE_VOL_ISSUE_PAGE.match(text)
+        if match:
+            if match.group('v1') is not None:
+                volume, issue, page_range = match.group('v1', 'i1', 'p1')
+            elif match.group('v2') is not None:
+                volume, issue, page_range = match.group('v2', 'i2', 'p2')
+            else:
+                volume, issue, page_range = match.group('v3'), "-", match.group('p3')
+            page_range = normalize_page_range(page_range)
 
     if page_range == "-":
-        pp_match = re.search(r'pp\.\s*([\d–\-—]+)', text, re.I)
+        pp_match = _RE_PP.search(text)
         if pp_match:
             page_range = normalize_page_range(pp_match.group(1))
 
-    # First Author
-    if ',' in raw_ref:
-        first_author = raw_ref.split(',')[0].strip()
+    # First Author (slice at the first delimiter instead of splitting the whole string)
+    comma_pos = raw_ref.find(',')
+    if comma_pos >= 0:
+        first_author = raw_ref[:comma_pos].strip()
     else:
+        year_pos = -1
         if year:
-            if year_in_parentheses:
-                year_str = f"({year})"
-            else:
-                year_str = f". {year}."
-
+            year_str = f"({year})" if year_in_parentheses else f". {year}."
             year_pos = raw_ref.find(year_str)
-            if year_pos > 0:
-                first_author = raw_ref[:year_pos].strip()
-            else:
-                first_author = raw_ref.split('.')[0].strip() if '.' in raw_ref else raw_ref.split()[0]
+
+        if year_pos > 0:
+            first_author = raw_ref[:year_pos].strip()
         else:
-            first_author = raw_ref.split('.')[0].strip() if '.' in raw_ref else raw_ref.split()[0]
+            dot_pos = raw_ref.find('.')
+            first_author = raw_ref[:dot_pos].strip() if dot_pos >= 0 else raw_ref.split(maxsplit=1)[0]
 
-    first_author = re.sub(r'^\[\d+\]\s*', '', first_author)
-    first_author = re.sub(r'\(\d{4}\)', '', first_author).strip()
-    first_author = re.sub(r'\.\s*\d{4}\.', '', first_author).strip()
+    first_author = _RE_BRACKET_NUM.sub('', first_author)
+    first_author = _RE_YEAR_PAREN.sub('', first_author).strip()
+    first_author = _RE_DOT_YEAR_DOT.sub('', first_author).strip()
 
     return {
         "raw_reference": raw_ref,
@@ -331,40 +420,109 @@ def parse_reference(raw_ref):
         "ref_volume": volume,
         "ref_issue": issue,
         "ref_page_range": page_range,
-        "doi": doi
+        "doi": doi,
+        "ref_title_std": standardize_title(title),
+        "ref_surname": extract_surname(first_author)
     }
 
 
 # ================= API Functions =================
 
+class RateLimiter:
+    """Space out request start times across worker threads"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+_RATE_LIMITER = RateLimiter(REQUEST_DELAY)
+
+# One pooled keep-alive session shared by all worker threads
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+
+def parse_json(response):
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# Lookups are memoized on their normalized key; request and decode errors
+# propagate out of the cached functions so transient failures are not cached.
+
+@lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def _fetch_openalex_by_doi(normalized_doi):
+    url = f"{OPENALEX_BASE}/doi:{normalized_doi}"
+    _RATE_LIMITER.wait()
+    r = _SESSION.get(url, timeout=10)
+    return parse_json(r) if r.status_code == 200 else None
+
+
 def query_openalex_by_doi(doi):
     if not doi:
         return None
     try:
-        normalized = normalize_doi(doi)
-        url = f"{OPENALEX_BASE}/doi:{normalized}"
-        r = requests.get(url, headers=HEADERS, timeout=10)
-        return r.json() if r.status_code == 200 else None
-    except requests.exceptions.RequestException:
+        return _fetch_openalex_by_doi(normalize_doi(doi))
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+
+
+@lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def _fetch_openalex_by_id(work_id):
+    _RATE_LIMITER.wait()
+    r = _SESSION.get(f"{OPENALEX_BASE}/{work_id}", timeout=10)
+    return parse_json(r) if r.status_code == 200 else None
+
+
+def query_openalex_by_id(openalex_id):
+    """Fetch a full OpenAlex work from its id (URL or bare W-number)"""
+    if not openalex_id:
+        return None
+    try:
+        return _fetch_openalex_by_id(openalex_id.rsplit("/", 1)[-1])
+    except (requests.exceptions.RequestException, ValueError):
         return None
 
 
+@lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def _fetch_openalex_by_title(t_short, max_results):
+    # Candidates only need enough fields to be scored; the winner is fetched in full
+    params = {"filter": f"title.search:{t_short}", "per-page": max_results, "select": "id,doi,title"}
+    _RATE_LIMITER.wait()
+    r = _SESSION.get(OPENALEX_BASE, params=params, timeout=10)
+    if r.status_code == 200:
+        return parse_json(r).get("results", [])
+    return []
+
+
 def query_openalex_by_title(title, max_results=10):
     if not title or title == "Unknown":
         return []
+    t = title.lower()
+    t = _RE_TITLE_QUERY_PUNCT.sub(' ', t)
+    t = _RE_WHITESPACE.sub(' ', t).strip()
+    words = t.split()
+    t_short = " ".join(words[:8])
     try:
-        t = title.lower()
-        t = re.sub(r'[&:?,;]', ' ', t)
-        t = re.sub(r'\s+', ' ', t).strip()
-        words = t.split()
-        t_short = " ".join(words[:8])
-
-        params = {"filter": f"title.search:{t_short}", "per-page": max_results}
-        r = requests.get(OPENALEX_BASE, headers=HEADERS, params=params, timeout=10)
-        if r.status_code == 200:
-            return r.json().get("results", [])
-        return []
-    except requests.exceptions.RequestException:
+        return _fetch_openalex_by_title(t_short, max_results)
+    except (requests.exceptions.RequestException, ValueError):
         return []
 
 
@@ -399,12 +557,12 @@ def extract_openalex_metadata(record):
 
     raw_oa_doi = record.get("doi")
     if raw_oa_doi:
-        m = re.search(r'(10\.\d{4,9}/[^\s"\'<>]+)', raw_oa_doi, re.I)
+        m = _RE_DOI_PLAIN.search(raw_oa_doi)
         oa_doi_plain = m.group(1).rstrip('.,;)') if m else raw_oa_doi
     else:
         oa_doi_plain = None
 
-    is_retracted = record.get("is_retracted", False)
+    is_retracted = bool(record.get("is_retracted"))
 
     doc_type_raw = record.get("type", "unknown")
     doc_type_map = {
@@ -422,7 +580,9 @@ def extract_openalex_metadata(record):
     return {
         "oa_full_author": full_author_list,
         "oa_first_author": first_author,
+        "oa_surname": extract_surname(first_author),
         "oa_title": title,
+        "oa_title_std": standardize_title(title),
         "oa_year": year,
         "oa_journal": source_name,
         "oa_volume": volume,
@@ -436,30 +596,41 @@ def extract_openalex_metadata(record):
     }
 
 
+@lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def _fetch_crossref_by_doi(normalized_doi):
+    url = f"{CROSSREF_BASE}/{normalized_doi}"
+    _RATE_LIMITER.wait()
+    r = _SESSION.get(url, timeout=10)
+    if r.status_code == 200:
+        return parse_json(r).get("message")
+    return None
+
+
 def query_crossref_by_doi(doi):
     if not doi:
         return None
     try:
-        normalized = normalize_doi(doi)
-        url = f"{CROSSREF_BASE}/{normalized}"
-        r = requests.get(url, headers=HEADERS, timeout=10)
-        if r.status_code == 200:
-            return r.json().get("message")
-        return None
-    except requests.exceptions.RequestException:
+        return _fetch_crossref_by_doi(normalize_doi(doi))
+    except (requests.exceptions.RequestException, ValueError):
         return None
 
 
+@lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def _fetch_crossref_by_title(title, max_results):
+    params = {"query.title": title, "rows": max_results}
+    _RATE_LIMITER.wait()
+    r = _SESSION.get(CROSSREF_BASE, params=params, timeout=10)
+    if r.status_code == 200:
+        return parse_json(r).get("message", {}).get("items", [])
+    return []
+
+
 def query_crossref_by_title(title, max_results=5):
     if not title or title == "Unknown":
         return []
     try:
-        params = {"query.title": title, "rows": max_results}
-        r = requests.get(CROSSREF_BASE, headers=HEADERS, params=params, timeout=10)
-        if r.status_code == 200:
-            return r.json().get("message", {}).get("items", [])
-        return []
-    except requests.exceptions.RequestException:
+        return _fetch_crossref_by_title(" ".join(title.split()), max_results)
+    except (requests.exceptions.RequestException, ValueError):
         return []
 
 
@@ -507,7 +678,9 @@ def extract_crossref_metadata(record):
     return {
         "oa_full_author": full_author_list,
         "oa_first_author": first_author,
+        "oa_surname": extract_surname(first_author),
         "oa_title": title,
+        "oa_title_std": standardize_title(title),
         "oa_year": year,
         "oa_journal": journal,
         "oa_volume": volume,
@@ -521,240 +694,401 @@ def extract_crossref_metadata(record):
     }
 
 
-def compare_metadata(parsed_ref, oa_meta):
-    diff = {}
-
-    ref_title_std = standardize_title(parsed_ref['ref_title'])
-    oa_title_std = standardize_title(oa_meta['oa_title'])
-    diff['oa_title'] = oa_meta['oa_title']
-    diff['oa_title_diff'] = ref_title_std != oa_title_std
-
-    ref_surname = extract_surname(parsed_ref['ref_first_author'])
-    oa_surname = extract_surname(oa_meta['oa_first_author'])
-    diff['oa_full_author'] = oa_meta['oa_full_author']
-    diff['oa_full_author_diff'] = ref_surname != oa_surname
-
-    ref_year = parsed_ref['ref_year']
-    oa_year = oa_meta['oa_year']
-    diff['oa_year'] = oa_year
-    if ref_year and oa_year:
-        delta = abs(ref_year - oa_year)
-        diff['oa_year_delta'] = delta
-        if delta == 0:
-            diff['oa_year_diff'] = False
-        elif delta <= 2:
-            diff['oa_year_diff'] = "minor"
-        else:
-            diff['oa_year_diff'] = True
-    else:
-        diff['oa_year_diff'] = True
-        diff['oa_year_delta'] = None
+def get_record_title(record, data_source):
+    """Return the title of a raw OpenAlex or Crossref record"""
+    if data_source == "OpenAlex":
+        return record.get("title", "")
+    title_list = record.get("title", [])
+    return title_list[0] if title_list else ""
 
-    for key in ['journal', 'volume', 'issue', 'page_range']:
-        ref_val = str(parsed_ref[f'ref_{key}'])
-        oa_val = str(oa_meta[f'oa_{key}'])
 
-        if key == 'page_range':
-            ref_val = normalize_page_range(ref_val)
-            oa_val = normalize_page_range(oa_val)
+_STATUS_BY_LEVEL = np.array(["unverified", "ambiguous", "verified"], dtype=object)
+_CONFIDENCE_BY_LEVEL = np.array(["low", "medium", "high"], dtype=object)
 
-        diff[f'oa_{key}'] = oa_val
-        diff[f'oa_{key}_diff'] = ref_val != oa_val
 
-    return diff
+def compare_and_verify(df):
+    """Compare metadata and assign status for every matched row in one pass"""
+    matched = df['data_source'] != "None"
+    if not matched.any():
+        return df
+    m = df[matched]
 
+    def set_matched(col, values):
+        # Write whole columns so unmatched rows keep their defaults and pandas
+        # can pick a common dtype
+        values = pd.Series(values, index=m.index).reindex(df.index)
+        df[col] = values.where(matched, df[col]) if col in df else values
 
-def verify_status(parsed_ref, oa_meta):
-    score = 0
+    set_matched('oa_title_diff', m['ref_title_std'] != m['oa_title_std'])
+    set_matched('oa_full_author_diff', m['ref_surname'] != m['oa_surname'])
 
-    title_score = fuzz.token_sort_ratio(
-        standardize_title(parsed_ref['ref_title']),
-        standardize_title(oa_meta['oa_title'])
+    # Non-numeric years ("Unknown") count as missing
+    ref_year = pd.to_numeric(m['ref_year'], errors='coerce')
+    oa_year = pd.to_numeric(m['oa_year'], errors='coerce')
+    year_delta = (ref_year - oa_year).abs()
+    year_diff = np.select(
+        [year_delta == 0, year_delta <= 2], [YEAR_SAME, YEAR_MINOR], default=YEAR_DIFFERENT
+    ).astype(np.int8)
+    set_matched('oa_year_delta', year_delta.astype('Int64'))
+    set_matched('oa_year_diff', year_diff)
+
+    # Page ranges are already normalized by the parser and metadata extractors
+    for key in ['journal', 'volume', 'issue', 'page_range']:
+        ref_val = m[f'ref_{key}'].astype(str)
+        oa_val = m[f'oa_{key}'].astype(str)
+        set_matched(f'oa_{key}', oa_val)
+        set_matched(f'oa_{key}_diff', ref_val != oa_val)
+
+    title_score = process.cpdist(
+        m['ref_title_std'].tolist(),
+        m['oa_title_std'].tolist(),
+        scorer=fuzz.token_sort_ratio,
+        processor=None
     )
-    if title_score >= 90:
-        score += 2
-    elif title_score >= 80:
-        score += 1
-
-    ref_surname = extract_surname(parsed_ref['ref_first_author'])
-    oa_surname = extract_surname(oa_meta['oa_first_author'])
-    if ref_surname and oa_surname and ref_surname == oa_surname:
-        score += 1
-
-    ref_year = parsed_ref['ref_year']
-    oa_year = oa_meta['oa_year']
-    if ref_year is not None and oa_year is not None and abs(ref_year - oa_year) <= 2:
-        score += 1
-
-    if score >= 4:
-        return "verified", "high"
-    elif score >= 2:
-        return "ambiguous", "medium"
+    surname_match = (m['ref_surname'] != "") & (m['oa_surname'] != "") & (m['ref_surname'] == m['oa_surname'])
+
+    # Branch-free scoring on int8 arrays: title 0-2 points, surname and year 1 each
+    score = (
+        (title_score >= 80).astype(np.int8)
+        + (title_score >= 90)
+        + surname_match.to_numpy(dtype=np.int8)
+        + (year_delta <= 2).to_numpy(dtype=np.int8)
+    )
+    level = (score >= 2).astype(np.int8) + (score >= 4)
+    set_matched('status', _STATUS_BY_LEVEL[level])
+    set_matched('confidence', _CONFIDENCE_BY_LEVEL[level])
+
+    return df
+
+
+def verify_reference(raw):
+    """Parse one reference and verify it against OpenAlex/Crossref"""
+    parsed = parse_reference(raw)
+
+    oa_record_from_doi = query_openalex_by_doi(parsed['doi'])
+    doi_lookup_success = bool(oa_record_from_doi)
+    doi_source = None
+
+    if oa_record_from_doi:
+        doi_source = "OpenAlex"
+    elif parsed['doi']:
+        crossref_record = query_crossref_by_doi(parsed['doi'])
+        if crossref_record:
+            oa_record_from_doi = crossref_record
+            doi_lookup_success = True
+            doi_source = "Crossref"
+
+    title_similarity_score = 0
+    if oa_record_from_doi:
+        oa_title_from_doi = get_record_title(oa_record_from_doi, doi_source)
+        title_similarity_score = fuzz.token_sort_ratio(
+            parsed["ref_title_std"],
+            standardize_title(oa_title_from_doi),
+            processor=None
+        )
+
+    # Source of oa_record; only replaced once a title match is accepted
+    oa_record = oa_record_from_doi
+    data_source = doi_source
+    matched_by_title = False
+    # A DOI hit with a matching title needs no title search and no rescoring
+    final_title_similarity = title_similarity_score
+
+    if not oa_record or title_similarity_score < TITLE_MISMATCH_THRESHOLD:
+        final_title_similarity = None
+        if parsed["ref_title"] != "Unknown":
+            candidates = query_openalex_by_title(parsed["ref_title"])
+            title_source = "OpenAlex"
+
+            if not candidates:
+                candidates = query_crossref_by_title(parsed["ref_title"])
+                title_source = "Crossref"
+
+            if candidates:
+                best = process.extractOne(
+                    parsed["ref_title_std"],
+                    [standardize_title(get_record_title(c, title_source)) for c in candidates],
+                    scorer=fuzz.token_sort_ratio,
+                    processor=None,
+                    score_cutoff=TITLE_THRESHOLD
+                )
+                if best:
+                    best_record = candidates[best[2]]
+                    if title_source == "OpenAlex":
+                        best_record = query_openalex_by_id(best_record.get("id"))
+                    if best_record:
+                        oa_record = best_record
+                        data_source = title_source
+                        matched_by_title = True
+                        final_title_similarity = best[1]
+
+    if oa_record:
+        if data_source == "OpenAlex":
+            oa_meta = extract_openalex_metadata(oa_record)
+        else:
+            oa_meta = extract_crossref_metadata(oa_record)
+
+        # Field diffs and status are filled in for all rows by compare_and_verify
+        meta_diff = {}
+        status, confidence = None, None
+
+        original_doi = parsed.get("doi")
+        oa_doi = oa_meta.get("oa_doi")
+
+        original_doi_norm = normalize_doi(original_doi)
+        oa_doi_norm = normalize_doi(oa_doi)
+
+        if final_title_similarity is None:
+            final_title_similarity = fuzz.token_sort_ratio(
+                parsed["ref_title_std"],
+                oa_meta["oa_title_std"],
+                processor=None
+            )
+
+        if original_doi:
+            if doi_lookup_success and final_title_similarity < TITLE_MISMATCH_THRESHOLD:
+                filled_doi = None
+                doi_fill_status = "doi_title_mismatch"
+            elif oa_doi_norm and original_doi_norm == oa_doi_norm and final_title_similarity >= TITLE_MISMATCH_THRESHOLD:
+                filled_doi = original_doi
+                doi_fill_status = "original_correct"
+            elif matched_by_title and oa_doi:
+                filled_doi = oa_doi
+                doi_fill_status = "title_matched_doi_corrected"
+            elif oa_doi and original_doi_norm != oa_doi_norm:
+                filled_doi = oa_doi
+                doi_fill_status = "original_wrong_corrected"
+            else:
+                filled_doi = original_doi
+                doi_fill_status = "original_unverified"
+        elif oa_doi:
+            filled_doi = oa_doi
+            doi_fill_status = "filled_from_database"
+        else:
+            filled_doi = None
+            doi_fill_status = "missing"
+
+        is_retracted = oa_meta.get('is_retracted', False)
     else:
-        return "unverified", "low"
+        oa_meta = {
+            k: "Unknown" for k in [
+                "oa_title", "oa_full_author", "oa_first_author", "oa_year", "oa_journal",
+                "oa_volume", "oa_issue", "oa_page_range", "openalex_id", "oa_doi"
+            ]
+        }
+        oa_meta['is_retracted'] = False
+        oa_meta['data_source'] = "None"
+        oa_meta['doc_type'] = "Unknown"
+        meta_diff = {f"{k}_diff": False for k in DIFF_FIELDS}
+        meta_diff['oa_year_diff'] = YEAR_DIFFERENT
+        meta_diff['oa_year_delta'] = None
+        status, confidence = "unverified", "unverified"
+        is_retracted = False
+
+        original_doi = parsed.get("doi")
+        if original_doi:
+            filled_doi = None
+            doi_fill_status = "unverified"
+        else:
+            filled_doi = None
+            doi_fill_status = "missing"
+
+    return {
+        **parsed,
+        **oa_meta,
+        **meta_diff,
+        "filled_doi": filled_doi,
+        "doi_fill_status": doi_fill_status,
+        "status": status,
+        "confidence": confidence
+    }
 
 
 def process_references(raw_references, progress_bar, status_text):
-    results = []
     total = len(raw_references)
+    rows = [None] * total
 
-    for idx, raw in enumerate(raw_references):
-        progress_bar.progress((idx + 1) / total)
-        status_text.text(f"Processing {idx + 1}/{total}...")
+    # Each widget update is a websocket round trip; cap them at ~100 per run
+    update_every = max(1, total // 100)
 
-        parsed = parse_reference(raw)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(verify_reference, raw): idx for idx, raw in enumerate(raw_references)}
 
-        oa_record_from_doi = query_openalex_by_doi(parsed['doi'])
-        doi_lookup_success = bool(oa_record_from_doi)
-        data_source = None
+        for done, future in enumerate(as_completed(futures), start=1):
+            rows[futures[future]] = future.result()
+            if done % update_every == 0 or done == total:
+                progress_bar.progress(done / total)
+                status_text.text(f"Processing {done}/{total}...")
 
-        if oa_record_from_doi:
-            data_source = "OpenAlex"
-        elif parsed['doi']:
-            crossref_record = query_crossref_by_doi(parsed['doi'])
-            if crossref_record:
-                oa_record_from_doi = crossref_record
-                doi_lookup_success = True
-                data_source = "Crossref"
+    # Build the frame column-wise in schema order so pandas never scans row dicts
+    columns = {col: [row.get(col) for row in rows] for col in RESULT_COLUMNS}
+    df = compare_and_verify(pd.DataFrame(columns, columns=RESULT_COLUMNS))
 
-        time.sleep(REQUEST_DELAY)
+    # Fixed-width flags so styling and counting never compare Python objects
+    df['oa_year_diff'] = df['oa_year_diff'].astype(np.int8)
+    flag_columns = ['is_retracted'] + [f"{col}_diff" for col in DIFF_FIELDS]
+    df[flag_columns] = df[flag_columns].astype(bool)
+    for col, categories in CATEGORY_COLUMNS.items():
+        df[col] = df[col].astype(pd.CategoricalDtype(categories))
+    return df
 
-        title_similarity_score = 0
-        if oa_record_from_doi:
-            if data_source == "OpenAlex":
-                oa_title_from_doi = oa_record_from_doi.get("title", "")
-            else:
-                title_list = oa_record_from_doi.get("title", [])
-                oa_title_from_doi = title_list[0] if title_list else ""
 
-            title_similarity_score = fuzz.token_sort_ratio(
-                standardize_title(parsed["ref_title"]),
-                standardize_title(oa_title_from_doi)
-            )
+def with_year_labels(df):
+    """Copy of the results with oa_year_diff spelled as documented (False / "minor" / True)"""
+    labeled = df.copy()
+    labeled['oa_year_diff'] = df['oa_year_diff'].map(YEAR_DIFF_LABELS)
+    return labeled
 
-        oa_record = oa_record_from_doi
-        matched_by_title = False
 
-        if not oa_record or title_similarity_score < TITLE_MISMATCH_THRESHOLD:
-            if parsed["ref_title"] != "Unknown":
-                candidates = query_openalex_by_title(parsed["ref_title"])
-                time.sleep(REQUEST_DELAY)
+def category_counts(values):
+    """Count each category of a categorical column from its integer codes"""
+    codes = values.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories))
+    return dict(zip(values.cat.categories, counts.tolist()))
 
-                if not candidates:
-                    candidates = query_crossref_by_title(parsed["ref_title"])
-                    data_source = "Crossref" if candidates else None
-                    time.sleep(REQUEST_DELAY)
-                else:
-                    data_source = "OpenAlex"
-
-                if candidates:
-                    best_score = 0
-                    best_record = None
-
-                    for c in candidates:
-                        if data_source == "OpenAlex":
-                            c_title = c.get("title", "")
-                        else:
-                            c_title_list = c.get("title", [])
-                            c_title = c_title_list[0] if c_title_list else ""
-
-                        score = fuzz.token_sort_ratio(
-                            standardize_title(parsed["ref_title"]),
-                            standardize_title(c_title)
-                        )
-                        if score > best_score:
-                            best_score = score
-                            best_record = c
-
-                    if best_score >= TITLE_THRESHOLD and best_record:
-                        oa_record = best_record
-                        matched_by_title = True
 
-        if oa_record:
-            if data_source == "OpenAlex":
-                oa_meta = extract_openalex_metadata(oa_record)
-            else:
-                oa_meta = extract_crossref_metadata(oa_record)
+# ================= Result Styling =================
 
-            meta_diff = compare_metadata(parsed, oa_meta)
-            status, confidence = verify_status(parsed, oa_meta)
+DOC_TYPE_CSS = {
+    "Journal Article": 'background-color: #E3F2FD; color: #1976D2; font-weight: bold',
+    "Conference Paper": 'background-color: #FFF3E0; color: #FF6F00; font-weight: bold',
+    "Book Chapter": 'background-color: #F3E5F5; color: #7B1FA2; font-weight: bold',
+    "Preprint": 'background-color: #E0F2F1; color: #00897B; font-weight: bold',
+}
 
-            original_doi = parsed.get("doi")
-            oa_doi = oa_meta.get("oa_doi")
+DATA_SOURCE_CSS = {
+    "OpenAlex": 'background-color: #E3F2FD; color: #1976D2; font-weight: bold',
+    "Crossref": 'background-color: #FFF3E0; color: #FF6F00; font-weight: bold',
+    "None": 'background-color: #F5F5F5; color: gray',
+}
 
-            original_doi_norm = normalize_doi(original_doi)
-            oa_doi_norm = normalize_doi(oa_doi)
+RETRACTED_CSS = {
+    True: 'background-color: #D32F2F; color: white; font-weight: bold',
+    False: 'background-color: #E8F5E9; color: #2E7D32',
+}
 
-            final_title_similarity = fuzz.token_sort_ratio(
-                standardize_title(parsed["ref_title"]),
-                standardize_title(oa_meta["oa_title"])
-            )
+DOI_FILL_CSS = {
+    "original_correct": 'background-color: #E8F5E9; color: #2E7D32; font-weight: bold',
+    "filled_from_database": 'background-color: #E3F2FD; color: #1976D2; font-weight: bold',
+    "title_matched_doi_corrected": 'background-color: #B3E5FC; color: #01579B; font-weight: bold',
+    "original_wrong_corrected": 'background-color: #FFA726; color: white; font-weight: bold',
+    "doi_title_mismatch": 'background-color: #E91E63; color: white; font-weight: bold',
+    "unverified": 'background-color: #FFCDD2; color: #C62828; font-weight: bold',
+    "missing": 'background-color: #F5F5F5; color: gray',
+}
 
-            if original_doi:
-                if doi_lookup_success and final_title_similarity < TITLE_MISMATCH_THRESHOLD:
-                    filled_doi = None
-                    doi_fill_status = "doi_title_mismatch"
-                elif oa_doi_norm and original_doi_norm == oa_doi_norm and final_title_similarity >= TITLE_MISMATCH_THRESHOLD:
-                    filled_doi = original_doi
-                    doi_fill_status = "original_correct"
-                elif matched_by_title and oa_doi:
-                    filled_doi = oa_doi
-                    doi_fill_status = "title_matched_doi_corrected"
-                elif oa_doi and original_doi_norm != oa_doi_norm:
-                    filled_doi = oa_doi
-                    doi_fill_status = "original_wrong_corrected"
-                else:
-                    filled_doi = original_doi
-                    doi_fill_status = "original_unverified"
-            elif oa_doi:
-                filled_doi = oa_doi
-                doi_fill_status = "filled_from_database"
-            else:
-                filled_doi = None
-                doi_fill_status = "missing"
+# Keyed by doi_fill_status
+FILLED_DOI_CSS = {
+    "filled_from_database": 'background-color: #E3F2FD; color: #1976D2; font-weight: bold',
+    "title_matched_doi_corrected": 'background-color: #B3E5FC; color: #01579B; font-weight: bold',
+    "original_wrong_corrected": 'background-color: #FFE0B2; color: #E65100; font-weight: bold',
+    "unverified": 'background-color: #FFCDD2; color: #C62828; font-weight: bold',
+    "doi_title_mismatch": 'background-color: #FFCDD2; color: #C62828; font-weight: bold',
+}
 
-            is_retracted = oa_meta.get('is_retracted', False)
-        else:
-            oa_meta = {
-                k: "Unknown" for k in [
-                    "oa_title", "oa_first_author", "oa_year", "oa_journal",
-                    "oa_volume", "oa_issue", "oa_page_range", "openalex_id", "oa_doi"
-                ]
-            }
-            oa_meta['is_retracted'] = False
-            oa_meta['data_source'] = "None"
-            oa_meta['doc_type'] = "Unknown"
-            meta_diff = {
-                f"{k}_diff": False for k in [
-                    "oa_title", "oa_first_author", "oa_year", "oa_journal",
-                    "oa_volume", "oa_issue", "oa_page_range", "openalex_id", "oa_doi"
-                ]
-            }
-            meta_diff['oa_year_diff'] = True
-            meta_diff['oa_year_delta'] = None
-            status, confidence = "unverified", "unverified"
-            is_retracted = False
-
-            original_doi = parsed.get("doi")
-            if original_doi:
-                filled_doi = None
-                doi_fill_status = "unverified"
-            else:
-                filled_doi = None
-                doi_fill_status = "missing"
-
-        result = {
-            **parsed,
-            **oa_meta,
-            **meta_diff,
-            "filled_doi": filled_doi,
-            "doi_fill_status": doi_fill_status,
-            "status": status,
-            "confidence": confidence
-        }
-        results.append(result)
+# Keyed by doi_fill_status
+ORIGINAL_DOI_CSS = {
+    "unverified": 'background-color: #FFCDD2; color: #C62828; font-weight: bold',
+    "doi_title_mismatch": 'background-color: #FFCDD2; color: #C62828; font-weight: bold',
+}
+
+# Indexed by the oa_year_diff code
+YEAR_DIFF_CSS = np.array([
+    'background-color: #E8F5E9; color: #2E7D32',
+    'background-color: #FFF9C4; color: #F57F17; font-weight: bold',
+    'background-color: #FFCDD2; color: #C62828',
+], dtype=object)
+
+STATUS_CSS = {
+    "verified": 'background-color: #E8F5E9; color: #2E7D32; font-weight: bold',
+    "ambiguous": 'background-color: #FFF9C4; color: #F57F17; font-weight: bold',
+    "unverified": 'background-color: #FFCDD2; color: #C62828; font-weight: bold',
+}
+
+CONFIDENCE_CSS = {
+    "high": 'background-color: #E8F5E9; color: #2E7D32',
+    "medium": 'background-color: #FFF9C4; color: #F57F17',
+    "low": 'background-color: #FFCDD2; color: #C62828',
+    "unverified": 'background-color: #FFCDD2; color: #C62828',
+}
+
+# Styled column -> (column whose value picks the style, CSS lookup)
+COLUMN_CSS = {
+    "doc_type": ("doc_type", DOC_TYPE_CSS),
+    "data_source": ("data_source", DATA_SOURCE_CSS),
+    "is_retracted": ("is_retracted", RETRACTED_CSS),
+    "doi_fill_status": ("doi_fill_status", DOI_FILL_CSS),
+    "filled_doi": ("doi_fill_status", FILLED_DOI_CSS),
+    "doi": ("doi_fill_status", ORIGINAL_DOI_CSS),
+    "status": ("status", STATUS_CSS),
+    "confidence": ("confidence", CONFIDENCE_CSS),
+}
+
+# Database fields: red when they differ from the reference, else by status
+DIFF_CSS = 'background-color: #FFCDD2; color: #C62828'
+FIELD_STATUS_CSS = {
+    "verified": 'background-color: #E8F5E9; color: #2E7D32',
+    "unverified": 'background-color: #FFEBEE; color: #C62828',
+}
+
+
+def css_from_map(values, css_map):
+    """Look up the CSS for each value of a column, '' when unmapped"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # One lookup per category, then index by code; code -1 (missing) hits the trailing ''
+        css = np.array([css_map.get(c, '') for c in values.cat.categories] + [''], dtype=object)
+        return css.take(values.cat.codes.to_numpy())
+    return values.astype(object).map(css_map).fillna('')
+
+
+def result_styles(df):
+    """Build the CSS for every cell at once, one vectorized rule per column"""
+    css = pd.DataFrame('', index=df.index, columns=df.columns)
+
+    for col, (source_col, css_map) in COLUMN_CSS.items():
+        css[col] = css_from_map(df[source_col], css_map)
+    css['oa_year'] = YEAR_DIFF_CSS.take(df['oa_year_diff'].to_numpy())
 
-    return results
+    # Per-row fallback shared by every database field
+    field_css = css_from_map(df['status'], FIELD_STATUS_CSS)
+    present = [col for col in DIFF_FIELDS if f"{col}_diff" in df.columns]
+    for col in present:
+        css[col] = np.where(df[f"{col}_diff"].to_numpy(dtype=bool), DIFF_CSS, field_css)
+
+    return css
+
+
+def cell_text(value):
+    """HTML-escaped display text for one table cell; whole-number floats drop the .0"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return escape(str(value))
+
+
+_escape_cell = np.frompyfunc(cell_text, 1, 1)
+
+
+@st.cache_data(show_spinner=False, max_entries=RESULT_CACHE_ENTRIES)
+def _render_table_html(df: pd.DataFrame) -> str:
+    """Render the styled results table to HTML once per distinct frame"""
+    # Whole-array string concatenation on object arrays; no Styler or template pass per cell
+    css = result_styles(df).to_numpy(dtype=object)
+    shown = with_year_labels(df)
+    text = _escape_cell(shown.astype(object).where(shown.notna(), '').to_numpy())
+    open_td = np.where(css == '', '<td>', '<td style="' + css + '">')
+    rows = (open_td + text + '</td>').sum(axis=1)
+
+    header = ''.join(f'<th>{escape(col)}</th>' for col in df.columns)
+    body = ''.join('<tr>' + rows + '</tr>')
+    return f'<table class="dataframe"><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>'
+
+
+@st.cache_data(show_spinner=False, max_entries=RESULT_CACHE_ENTRIES)
+def _encode_csv(df: pd.DataFrame) -> bytes:
+    """Serialize the results to CSV bytes once per distinct frame"""
+    buf = BytesIO()
+    with_year_labels(df).to_csv(buf, index=False, encoding='utf-8')
+    return buf.getvalue()
 
 
 # ================= Streamlit UI =================
@@ -812,23 +1146,15 @@ def main():
         status_text = st.empty()
 
         # Process references
-        results = process_references(references, progress_bar, status_text)
+        df = process_references(references, progress_bar, status_text)
 
         progress_bar.empty()
         status_text.empty()
 
-        # Create DataFrame
-        df = pd.DataFrame(results)
-
         status_icon_map = {"verified": "✅", "ambiguous": "⚠️", "unverified": "❌"}
-        df['status_icon'] = df['status'].map(status_icon_map)
+        df['status_icon'] = df['status'].cat.rename_categories(status_icon_map)
 
-        # Reorder columns
-        front_cols = ["status", "confidence", "status_icon", "is_retracted", "doc_type", "data_source"]
-        doi_cols = ["doi", "filled_doi", "doi_fill_status"]
-        other_cols = [c for c in df.columns if
-                      c not in front_cols + doi_cols + ["oa_first_author_diff", "openalex_id_diff"]]
-        df = df[front_cols + doi_cols + other_cols]
+        df = df[DISPLAY_COLUMNS]
 
         # Statistics
         st.markdown("---")
@@ -836,10 +1162,16 @@ def main():
 
         col1, col2, col3, col4 = st.columns(4)
 
-        verified_count = len(df[df['status'] == 'verified'])
-        ambiguous_count = len(df[df['status'] == 'ambiguous'])
-        unverified_count = len(df[df['status'] == 'unverified'])
-        retracted_count = len(df[df['is_retracted'] == True])
+        # One counting pass per column instead of a filtered frame per metric
+        status_counts = category_counts(df['status'])
+        doc_counts = category_counts(df['doc_type'])
+        src_counts = category_counts(df['data_source'])
+        doi_counts = category_counts(df['doi_fill_status'])
+
+        verified_count = status_counts.get('verified', 0)
+        ambiguous_count = status_counts.get('ambiguous', 0)
+        unverified_count = status_counts.get('unverified', 0)
+        retracted_count = int(df['is_retracted'].sum())
 
         col1.metric("✅ Verified", f"{verified_count} ({verified_count / len(df) * 100:.1f}%)")
         col2.metric("⚠️ Ambiguous", f"{ambiguous_count} ({ambiguous_count / len(df) * 100:.1f}%)")
@@ -850,9 +1182,9 @@ def main():
         st.markdown("### 📄 Document Types")
         col1, col2, col3 = st.columns(3)
 
-        journal_count = len(df[df['doc_type'] == 'Journal Article'])
-        conf_count = len(df[df['doc_type'] == 'Conference Paper'])
-        book_count = len(df[df['doc_type'] == 'Book Chapter'])
+        journal_count = doc_counts.get('Journal Article', 0)
+        conf_count = doc_counts.get('Conference Paper', 0)
+        book_count = doc_counts.get('Book Chapter', 0)
 
         col1.metric("📘 Journal Articles", journal_count)
         col2.metric("📙 Conference Papers", conf_count)
@@ -862,9 +1194,9 @@ def main():
         st.markdown("### 🗄️ Data Sources")
         col1, col2, col3 = st.columns(3)
 
-        openalex_count = len(df[df['data_source'] == 'OpenAlex'])
-        crossref_count = len(df[df['data_source'] == 'Crossref'])
-        none_count = len(df[df['data_source'] == 'None'])
+        openalex_count = src_counts.get('OpenAlex', 0)
+        crossref_count = src_counts.get('Crossref', 0)
+        none_count = src_counts.get('None', 0)
 
         col1.metric("📘 OpenAlex", openalex_count)
         col2.metric("📙 Crossref", crossref_count)
@@ -874,10 +1206,10 @@ def main():
         st.markdown("### 📋 DOI Status")
         col1, col2, col3, col4 = st.columns(4)
 
-        doi_correct = len(df[df['doi_fill_status'] == 'original_correct'])
-        doi_filled = len(df[df['doi_fill_status'] == 'filled_from_database'])
-        doi_corrected = len(df[df['doi_fill_status'] == 'original_wrong_corrected'])
-        doi_missing = len(df[df['doi_fill_status'] == 'missing'])
+        doi_correct = doi_counts.get('original_correct', 0)
+        doi_filled = doi_counts.get('filled_from_database', 0)
+        doi_corrected = doi_counts.get('original_wrong_corrected', 0)
+        doi_missing = doi_counts.get('missing', 0)
 
         col1.metric("✓ Correct", doi_correct)
         col2.metric("➕ Filled", doi_filled)
@@ -888,121 +1220,14 @@ def main():
         st.markdown("---")
         st.subheader("📋 Detailed Results")
 
-        # Color mapping function
-        def color_cells(val, column_name, row):
-            """Apply colors based on verification status and differences"""
-
-            # Document Type colors
-            if column_name == "doc_type":
-                if val == "Journal Article":
-                    return 'background-color: #E3F2FD; color: #1976D2; font-weight: bold'
-                elif val == "Conference Paper":
-                    return 'background-color: #FFF3E0; color: #FF6F00; font-weight: bold'
-                elif val == "Book Chapter":
-                    return 'background-color: #F3E5F5; color: #7B1FA2; font-weight: bold'
-                elif val == "Preprint":
-                    return 'background-color: #E0F2F1; color: #00897B; font-weight: bold'
-
-            # Data Source colors
-            if column_name == "data_source":
-                if val == "OpenAlex":
-                    return 'background-color: #E3F2FD; color: #1976D2; font-weight: bold'
-                elif val == "Crossref":
-                    return 'background-color: #FFF3E0; color: #FF6F00; font-weight: bold'
-                elif val == "None":
-                    return 'background-color: #F5F5F5; color: gray'
-
-            # Retraction warning
-            if column_name == "is_retracted":
-                if val == True:
-                    return 'background-color: #D32F2F; color: white; font-weight: bold'
-                else:
-                    return 'background-color: #E8F5E9; color: #2E7D32'
-
-            # DOI Fill Status colors
-            if column_name == "doi_fill_status":
-                if val == "original_correct":
-                    return 'background-color: #E8F5E9; color: #2E7D32; font-weight: bold'
-                elif val == "filled_from_database":
-                    return 'background-color: #E3F2FD; color: #1976D2; font-weight: bold'
-                elif val == "title_matched_doi_corrected":
-                    return 'background-color: #B3E5FC; color: #01579B; font-weight: bold'
-                elif val == "original_wrong_corrected":
-                    return 'background-color: #FFA726; color: white; font-weight: bold'
-                elif val == "doi_title_mismatch":
-                    return 'background-color: #E91E63; color: white; font-weight: bold'
-                elif val == "unverified":
-                    return 'background-color: #FFCDD2; color: #C62828; font-weight: bold'
-                elif val == "missing":
-                    return 'background-color: #F5F5F5; color: gray'
-
-            # Filled DOI colors
-            if column_name == "filled_doi":
-                status = row['doi_fill_status']
-                if status == "filled_from_database":
-                    return 'background-color: #E3F2FD; color: #1976D2; font-weight: bold'
-                elif status == "title_matched_doi_corrected":
-                    return 'background-color: #B3E5FC; color: #01579B; font-weight: bold'
-                elif status == "original_wrong_corrected":
-                    return 'background-color: #FFE0B2; color: #E65100; font-weight: bold'
-                elif status in ["unverified", "doi_title_mismatch"]:
-                    return 'background-color: #FFCDD2; color: #C62828; font-weight: bold'
-
-            # Original DOI colors
-            if column_name == "doi":
-                status = row['doi_fill_status']
-                if status in ["unverified", "doi_title_mismatch"]:
-                    return 'background-color: #FFCDD2; color: #C62828; font-weight: bold'
-
-            # Year difference colors
-            if column_name == "oa_year":
-                if row['oa_year_diff'] == False:
-                    return 'background-color: #E8F5E9; color: #2E7D32'
-                elif row['oa_year_diff'] == "minor":
-                    return 'background-color: #FFF9C4; color: #F57F17; font-weight: bold'
-                elif row['oa_year_diff'] == True:
-                    return 'background-color: #FFCDD2; color: #C62828'
-
-            # Highlight differences in OpenAlex data
-            if column_name in ["oa_title", "oa_full_author", "oa_journal", "oa_volume", "oa_issue", "oa_page_range"]:
-                diff_col = f"{column_name}_diff"
-                if diff_col in row and row[diff_col] == True:
-                    return 'background-color: #FFCDD2; color: #C62828'
-                elif row['status'] == 'verified':
-                    return 'background-color: #E8F5E9; color: #2E7D32'
-                elif row['status'] == 'unverified':
-                    return 'background-color: #FFEBEE; color: #C62828'
-
-            # Status colors
-            if column_name == "status":
-                if val == "verified":
-                    return 'background-color: #E8F5E9; color: #2E7D32; font-weight: bold'
-                elif val == "ambiguous":
-                    return 'background-color: #FFF9C4; color: #F57F17; font-weight: bold'
-                elif val == "unverified":
-                    return 'background-color: #FFCDD2; color: #C62828; font-weight: bold'
-
-            # Confidence colors
-            if column_name == "confidence":
-                if val == "high":
-                    return 'background-color: #E8F5E9; color: #2E7D32'
-                elif val == "medium":
-                    return 'background-color: #FFF9C4; color: #F57F17'
-                elif val == "low" or val == "unverified":
-                    return 'background-color: #FFCDD2; color: #C62828'
-
-            return ''
-
-        # Apply styling with color function
-        def apply_row_styles(row):
-            return [color_cells(val, col, row) for col, val in row.items()]
-
-        styled_df = df.style.apply(apply_row_styles, axis=1)
-
         # Display with custom CSS
         st.markdown("""
         <style>
         /* Make table more readable */
+        .results-table {
+            height: 500px;
+            overflow: auto;
+        }
         .dataframe {
             font-size: 11px;
         }
@@ -1020,10 +1245,16 @@ def main():
         </style>
         """, unsafe_allow_html=True)
 
-        st.dataframe(styled_df, use_container_width=True, height=500)
+        if len(df) > STYLE_ROW_LIMIT:
+            # Cell styling scales with the cell count; show the plain grid instead
+            st.caption(f"Cell highlighting is turned off above {STYLE_ROW_LIMIT} references.")
+            st.dataframe(with_year_labels(df), use_container_width=True, height=500)
+        else:
+            # Static HTML skips the Arrow round trip; the <style> block above applies to it
+            st.markdown(f'<div class="results-table">{_render_table_html(df)}</div>', unsafe_allow_html=True)
 
         # Download button
-        csv = df.to_csv(index=False).encode('utf-8')
+        csv = _encode_csv(df)
         st.download_button(
             label="💾 Download Results (CSV)",
             data=csv,